@@ -0,0 +1,380 @@
+# Copyright (c) 2026 LouFou (https://github.com/loufou-lf)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+LXD REST Client
+
+Async helpers speaking to the LXD API over its Unix socket, used by the
+backend for container lifecycle actions.
+"""
+
+import asyncio
+import httpx
+import ijson
+import orjson
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+LXD_SOCKET = "/var/snap/lxd/common/lxd/unix.socket"
+
+# Simplestreams server behind the lxc "images:" remote
+IMAGES_SERVER = "https://images.lxd.canonical.com"
+IMAGES_INDEX = "/streams/v1/images.json"
+
+# Simplestreams item types providing a container root filesystem
+CONTAINER_FTYPES = frozenset({"squashfs", "root.tar.xz"})
+
+# Last catalog listing per architecture, with the validators to revalidate it
+IMAGES_CATALOG = {}  # architecture -> (etag, last-modified, images)
+
+# Host public key mounted by docker-compose
+HOST_KEY_PATH = "/root/host_key.pub"
+
+# Seconds a container gets to shut down cleanly before being force-stopped
+STOP_TIMEOUT = 30
+
+# Shared client; idle connections are kept open across dashboard polls.
+# Reads are not limited: LXD builds a whole listing before answering,
+# which can take a while on large hosts.
+client = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        uds=LXD_SOCKET,
+        limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60)
+    ),
+    base_url="http://lxd",
+    timeout=httpx.Timeout(10, read=None)
+)
+
+# Client for the remote image catalog
+images_client = httpx.AsyncClient(base_url=IMAGES_SERVER, timeout=60)
+
+# Wrapper running a command with its stdout discarded (only stderr is kept)
+DISCARD_STDOUT = ["sh", "-c", 'exec "$@" > /dev/null', "sh"]
+
+# Shell snippet run inside new containers to set up key-based SSH access
+SSH_SETUP = """
+mkdir -p /home/$CT_USER/.ssh
+echo "$HOST_PUBKEY" > /home/$CT_USER/.ssh/authorized_keys
+chown -R $CT_USER:$CT_USER /home/$CT_USER/.ssh
+chmod 700 /home/$CT_USER/.ssh
+chmod 600 /home/$CT_USER/.ssh/authorized_keys
+
+# Configure sshd for key-based authentication
+if [ -f /etc/ssh/sshd_config ]; then
+    sed -i 's/^#\\?PasswordAuthentication.*/PasswordAuthentication no/' /etc/ssh/sshd_config
+    sed -i 's/^#\\?PubkeyAuthentication.*/PubkeyAuthentication yes/' /etc/ssh/sshd_config
+    sed -i 's/^#\\?AuthorizedKeysFile.*/AuthorizedKeysFile .ssh\\/authorized_keys/' /etc/ssh/sshd_config
+fi
+
+# Override any sshd_config.d settings that might enable password auth
+if [ -d /etc/ssh/sshd_config.d ]; then
+    echo 'PasswordAuthentication no' > /etc/ssh/sshd_config.d/90-easy-lxc.conf
+    echo 'PubkeyAuthentication yes' >> /etc/ssh/sshd_config.d/90-easy-lxc.conf
+fi
+
+# Enable and restart sshd service
+systemctl daemon-reload
+systemctl enable ssh 2>/dev/null || systemctl enable sshd 2>/dev/null
+systemctl restart ssh 2>/dev/null || systemctl restart sshd 2>/dev/null
+"""
+
+
+class LXDError(Exception):
+    """Raised when the LXD API reports a failed request or operation."""
+
+
+class _ResponseReader:
+    """File-like async reader over a streamed response, as ijson expects."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0), which must not consume
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+# =============================================================================
+# Low-level API
+# =============================================================================
+
+
+async def request(method: str, path: str, **kwargs):
+    """
+    Send a request to the LXD REST API.
+
+    Background operations returned by LXD are waited on before returning.
+
+    Args:
+        method: HTTP method
+        path: API path (e.g. /1.0/instances)
+        **kwargs: Extra arguments passed to httpx (params, json, ...)
+
+    Returns:
+        The response (or finished operation) metadata
+
+    Raises:
+        LXDError: If LXD reports an error
+    """
+    response = await client.request(method, path, **kwargs)
+    body = orjson.loads(response.content)
+
+    if body.get("type") == "error":
+        raise LXDError(body.get("error") or f"LXD error {body.get('error_code')}")
+
+    if body.get("type") == "async":
+        response = await client.get(
+            f"{body['operation']}/wait", timeout=None
+        )
+        body = orjson.loads(response.content)
+        if body.get("type") == "error":
+            raise LXDError(body.get("error") or f"LXD error {body.get('error_code')}")
+
+        operation = body.get("metadata") or {}
+        if operation.get("status") != "Success":
+            raise LXDError(operation.get("err") or f"Operation {operation.get('status')}")
+        return operation
+
+    return body.get("metadata")
+
+
+async def iter_instances(recursion: int = 1, status_filter: str = None):
+    """
+    Yield the instances one at a time as they are received.
+
+    The listing is parsed incrementally, so neither the whole response nor
+    the whole decoded list is held in memory at once.
+
+    Args:
+        recursion: 1 for instance objects, 2 to include their state
+        status_filter: Optional LXD filter (e.g. 'status eq Running')
+
+    Raises:
+        LXDError: If LXD reports an error
+    """
+    params = {"recursion": recursion}
+    if status_filter:
+        params["filter"] = status_filter
+
+    async with client.stream("GET", "/1.0/instances", params=params) as response:
+        if response.status_code != 200:
+            body = orjson.loads(await response.aread())
+            raise LXDError(body.get("error") or f"LXD error {body.get('error_code')}")
+
+        async for instance in ijson.items(
+            _ResponseReader(response), "metadata.item", use_float=True
+        ):
+            yield instance
+
+
+async def exec_command(name: str, command: list, environment: dict = None):
+    """
+    Run a command inside an instance and wait for it to finish.
+
+    Only stderr is recorded by LXD, and it is only read back on failure.
+
+    Args:
+        name: Instance name
+        command: Command and its arguments
+        environment: Extra environment variables for the command
+
+    Raises:
+        LXDError: If the command exits with a non-zero status
+    """
+    operation = await request(
+        "POST", f"/1.0/instances/{name}/exec",
+        json={
+            "command": DISCARD_STDOUT + command,
+            "environment": environment or {},
+            "wait-for-websocket": False,
+            "interactive": False,
+            "record-output": True
+        }
+    )
+
+    metadata = operation.get("metadata") or {}
+    logs = metadata.get("output") or {}
+    return_code = metadata.get("return")
+
+    try:
+        if return_code != 0:
+            stderr = ""
+            if "2" in logs:
+                response = await client.get(logs["2"])
+                stderr = response.content.decode(errors="replace").strip()
+            raise LXDError(stderr or f"{command[0]} exited with status {return_code}")
+    finally:
+        for log in logs.values():
+            await client.delete(log)
+
+
+async def list_remote_images(architecture: str) -> list:
+    """
+    List the container images published on the images: remote.
+
+    Reads the simplestreams catalog directly, as 'lxc image list images:'
+    does, without going through the lxc CLI. The request is conditional, so
+    an unchanged catalog is answered with a bodiless 304.
+
+    Args:
+        architecture: LXD architecture name (e.g. amd64)
+
+    Returns:
+        List of simplestreams products (dicts with 'os', 'release', ...),
+        without their version lists
+    """
+    headers = {}
+    cached = IMAGES_CATALOG.get(architecture)
+    if cached is not None:
+        etag, last_modified, images = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await images_client.get(IMAGES_INDEX, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return images
+    response.raise_for_status()
+    products = orjson.loads(response.content).get("products", {})
+
+    images = [
+        {key: value for key, value in product.items() if key != "versions"}
+        for product in products.values()
+        if product.get("arch") == architecture
+        and any(
+            item.get("ftype") in CONTAINER_FTYPES
+            for version in product.get("versions", {}).values()
+            for item in version.get("items", {}).values()
+        )
+    ]
+    IMAGES_CATALOG[architecture] = (
+        response.headers.get("etag"),
+        response.headers.get("last-modified"),
+        images
+    )
+    return images
+
+
+async def close():
+    """Close the shared clients and their pooled connections."""
+    await client.aclose()
+    await images_client.aclose()
+
+
+# =============================================================================
+# Container Actions
+# =============================================================================
+
+
+async def create(name: str, user: str, password: str, distro: str, version: str):
+    """
+    Create, start and provision a container.
+
+    Installs SSH, creates a sudo user and authorizes the host key.
+
+    Args:
+        name: Container name
+        user: Login of the user to create
+        password: Password of the user
+        distro: Distribution name (e.g. debian)
+        version: Distribution release (ignored for kali)
+    """
+    name = name.lower()
+    user = user.lower()
+    alias = "kali" if distro == "kali" else f"{distro}/{version}"
+
+    await request(
+        "POST", "/1.0/instances",
+        json={
+            "name": name,
+            "type": "container",
+            "source": {
+                "type": "image",
+                "mode": "pull",
+                "server": IMAGES_SERVER,
+                "protocol": "simplestreams",
+                "alias": alias
+            }
+        }
+    )
+    await start(name)
+    await asyncio.sleep(5)  # Let the network come up
+
+    apt_env = {"DEBIAN_FRONTEND": "noninteractive"}
+    await exec_command(name, ["apt-get", "update"], apt_env)
+    await exec_command(name, ["apt-get", "-y", "upgrade"], apt_env)
+    await exec_command(
+        name, ["apt-get", "-y", "install", "openssh-server", "python3", "sudo"], apt_env
+    )
+
+    await exec_command(name, ["useradd", "-m", "-G", "sudo", "-s", "/bin/bash", user])
+    await exec_command(
+        name, ["sh", "-c", 'echo "$CT_USER:$CT_PASSWORD" | chpasswd'],
+        {"CT_USER": user, "CT_PASSWORD": password}
+    )
+    await exec_command(
+        name, ["sh", "-c", "echo '%sudo ALL=(ALL) ALL' > /etc/sudoers.d/sudo"]
+    )
+
+    try:
+        with open(HOST_KEY_PATH) as f:
+            host_pubkey = f.read().strip()
+    except OSError:
+        raise LXDError(
+            'SSH key missing. Generate one with: '
+            'ssh-keygen -t ed25519 -N "" -f "$HOME/.ssh/id_ed25519"'
+        )
+
+    await exec_command(
+        name, ["sh", "-c", SSH_SETUP],
+        {"CT_USER": user, "HOST_PUBKEY": host_pubkey}
+    )
+
+
+async def start(name: str):
+    """Start a container."""
+    await request(
+        "PUT", f"/1.0/instances/{name}/state", json={"action": "start"}
+    )
+
+
+async def stop(name: str):
+    """Stop a container, force-stopping it if it doesn't shut down in time."""
+    try:
+        await request(
+            "PUT", f"/1.0/instances/{name}/state",
+            json={"action": "stop", "timeout": STOP_TIMEOUT}
+        )
+    except LXDError:
+        await request(
+            "PUT", f"/1.0/instances/{name}/state",
+            json={"action": "stop", "force": True}
+        )
+
+
+async def delete(name: str):
+    """Delete a container, force-stopping it first if needed."""
+    instance = await request("GET", f"/1.0/instances/{name}")
+    if instance.get("status") != "Stopped":
+        await request(
+            "PUT", f"/1.0/instances/{name}/state",
+            json={"action": "stop", "force": True}
+        )
+    await request("DELETE", f"/1.0/instances/{name}")
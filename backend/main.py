@@ -19,39 +19,71 @@ Easy LXC Backend API
 A FastAPI-based REST API for managing LXD containers.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import subprocess
-import json
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
+import orjson
+from packaging.version import InvalidVersion, Version
+import asyncio
+import hashlib
 import os
 import time
 import platform
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import NamedTuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import lxd_client
+
 # =============================================================================
 # Configuration
 # =============================================================================
 
-IMAGES_CACHE = {}
-LAST_CACHE_UPDATE = 0
 CACHE_DURATION = 3600  # 1 hour
+IMAGES_CACHE = None  # (encoded body, etag) of the image catalog
+IMAGES_LOCK = asyncio.Lock()  # Serializes image catalog refreshes
+IMAGES_RETRY = 60  # seconds before retrying a failed catalog refresh
+
+CONTAINERS_CACHE = None  # (encoded body, etag)
+LAST_CONTAINERS_UPDATE = 0
+CONTAINERS_CACHE_DURATION = 2  # seconds
+CONTAINERS_REFRESH = None  # In-flight refresh task shared by concurrent callers
+CONTAINERS_GENERATION = 0  # Bumped on invalidation to redo in-flight refreshes
+CONTAINERS_CHANGED = asyncio.Condition()  # Notified when a new snapshot is stored
+STREAM_KEEPALIVE = 15  # seconds between SSE comments on an idle stream
+
+CPU_CACHE = {}  # Last CPU sample of each running container
+CONFIG_CACHE = {}  # container name -> (image os, release, architecture)
 
-CPU_CACHE = {}
+# Host-side metric sources (used when LXD reports no usage)
+CGROUP_ROOT = os.environ.get("CGROUP_ROOT", "/sys/fs/cgroup")
+STORAGE_POOLS_DIR = "/var/snap/lxd/common/lxd/storage-pools"
+METRIC_PATHS = {}  # container name -> (memory counter path, rootfs path)
+MEMORY_FDS = {}  # container name -> open fd of its memory counter
 
-LXD_ENV = {
-    **os.environ,
-    "LXD_DIR": "/var/snap/lxd/common/lxd"
-}
+WHITELIST_OS = frozenset({"debian", "ubuntu", "kali"})
 
-WHITELIST_OS = ["debian", "ubuntu", "kali"]
+# Strips whitespace from user-supplied distro names
+_DISTRO_TBL = str.maketrans("", "", " \t")
 
-# Task tracking storage
-TASK_STORE = {}
-TASK_EXPIRY = 300  # Tasks expire after 5 minutes
+# Host architecture, mapped to LXD naming
+_ARCH = platform.machine()
+LXC_ARCH = {"x86_64": "amd64", "aarch64": "arm64"}.get(_ARCH, _ARCH)
+
+# Task tracking storage (finished tasks are moved to the end, in expiry order)
+TASK_STORE = OrderedDict()
+TASK_EXPIRY = 300  # Finished tasks expire after 5 minutes
+
+# Background actions are queued and started by a single worker, in a
+# bounded pool to avoid flooding LXD
+MAX_CONCURRENT_ACTIONS = 4
+ACTION_SEM = asyncio.Semaphore(MAX_CONCURRENT_ACTIONS)
+ACTION_QUEUE = asyncio.Queue()  # run_tracked_task arguments
+BACKGROUND_TASKS = set()  # Strong references to scheduled asyncio tasks
 
 
 @dataclass
@@ -66,14 +98,64 @@ class TaskResult:
     created_at: float = field(default_factory=time.time)
     completed_at: Optional[float] = None
 
+
+@dataclass(slots=True)
+class CpuSample:
+    """Cumulative CPU usage of a container at a monotonic timestamp."""
+    t_ns: int
+    usage_ns: int
+
+
+@dataclass(slots=True)
+class ContainerRow:
+    """A row of the /containers payload (serialized natively by orjson)."""
+    name: str
+    status: str
+    ipv4: str
+    memory: int
+    disk: int
+    cpu_percent: float
+    os: str
+    release: str
+    architecture: str
+
+class InstanceInfo(NamedTuple):
+    """The fields of an LXD instance used by the dashboard."""
+    name: str
+    status: str
+    running: bool  # Running and reporting state
+    os: str
+    release: str
+    architecture: str
+    network: dict
+    memory_usage: int
+    disk_usage: int
+    cpu_usage_ns: int
+    proxies: list  # [(device name, listen, connect)]
+
 # =============================================================================
 # Application Setup
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background workers and release the LXD pool on shutdown."""
+    collector = asyncio.create_task(collect_containers_loop())
+    action_worker = asyncio.create_task(run_action_queue())
+    images_refresher = asyncio.create_task(refresh_images_loop())
+    yield
+    images_refresher.cancel()
+    action_worker.cancel()
+    collector.cancel()
+    await lxd_client.close()
+
+
 app = FastAPI(
     title="Easy LXC API",
     description="REST API for managing LXD containers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -97,6 +179,15 @@ class ContainerRequest(BaseModel):
     distro: str
     version: str
 
+    @field_validator("distro")
+    @classmethod
+    def _clean_distro(cls, v: str) -> str:
+        """Normalize the distro name and check it is supported."""
+        v = v.translate(_DISTRO_TBL).casefold()
+        if v not in WHITELIST_OS:
+            raise ValueError(f"unsupported distro: {v}")
+        return v
+
 
 class ExposeRequest(BaseModel):
     """Request model for port exposure."""
@@ -110,74 +201,282 @@ class ExposeRequest(BaseModel):
 
 
 def cleanup_old_tasks():
-    """Remove expired tasks from the store."""
+    """Remove tasks that finished more than TASK_EXPIRY seconds ago."""
     current_time = time.time()
-    expired = [
-        task_id for task_id, task in TASK_STORE.items()
-        if current_time - task.created_at > TASK_EXPIRY
-    ]
+    expired = []
+    for task_id, task in TASK_STORE.items():
+        if task.completed_at is None:
+            continue  # Pending and running tasks are always kept
+        if current_time - task.completed_at <= TASK_EXPIRY:
+            break
+        expired.append(task_id)
     for task_id in expired:
         del TASK_STORE[task_id]
 
 
-def run_script(script_name: str, args: list) -> dict:
+def cleanup_cpu_cache(live: set):
+    """Remove CPU samples of containers that are no longer running."""
+    for stale in CPU_CACHE.keys() - live:
+        del CPU_CACHE[stale]
+
+
+def cleanup_config_cache(live: set):
+    """Remove image details of containers that no longer exist."""
+    for stale in CONFIG_CACHE.keys() - live:
+        del CONFIG_CACHE[stale]
+
+
+def encode_payload(payload) -> tuple:
+    """
+    Serialize a response payload and compute its ETag.
+
+    Args:
+        payload: JSON-serializable response content
+
+    Returns:
+        tuple of (JSON bytes, quoted ETag)
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return body, etag
+
+
+def etag_response(
+    request: Request, body: bytes, etag: str, max_age: Optional[int] = None
+) -> Response:
+    """
+    Return the encoded body, or 304 Not Modified if the client has it.
+
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        body: Encoded payload
+        etag: Quoted ETag of the payload
+        max_age: Seconds the client may reuse the response without asking;
+            by default it must revalidate with the ETag every time
+    """
+    cache_control = "no-cache" if max_age is None else f"max-age={max_age}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def project_instance(c: dict) -> InstanceInfo:
+    """
+    Extract the dashboard fields from a raw LXD instance.
+
+    Args:
+        c: Instance object, with its state under 'state' if running
+
+    Returns:
+        InstanceInfo with defaults for missing fields
+    """
+    name = c.get("name", "unknown")
+    status = c.get("status", "Unknown")
+    state = c.get("state") or {}
+    devices = c.get("devices") or {}
+
+    # The image a container was created from never changes
+    image = CONFIG_CACHE.get(name)
+    if image is None:
+        config = c.get("config") or {}
+        if config:
+            image = CONFIG_CACHE[name] = (
+                config.get("image.os", "Unknown"),
+                config.get("image.release", "Unknown"),
+                config.get("image.architecture", "Unknown")
+            )
+        else:
+            image = ("-", "-", "-")
+    os_name, release, architecture = image
+
+    disk = state.get("disk", {})
+    disk_usage = 0
+    if isinstance(disk, dict):
+        for _, d in disk.items():
+            disk_usage += d.get("usage", 0)
+
+    return InstanceInfo(
+        name=name,
+        status=status,
+        running=status == "Running" and bool(state),
+        os=os_name,
+        release=release,
+        architecture=architecture,
+        network=state.get("network") or {},
+        memory_usage=state.get("memory", {}).get("usage", 0),
+        disk_usage=disk_usage,
+        cpu_usage_ns=state.get("cpu", {}).get("usage", 0),
+        proxies=[
+            (dev_name, dev.get("listen", ""), dev.get("connect", ""))
+            for dev_name, dev in devices.items()
+            if dev.get("type") == "proxy"
+        ]
+    )
+
+
+def resolve_metric_paths(name: str) -> tuple:
     """
-    Execute a shell script with the given arguments.
+    Locate the host-side memory counter and rootfs of a container.
+
+    The lookup result is cached in METRIC_PATHS, so the filesystem is
+    only probed once per container.
 
     Args:
-        script_name: Name of the script in /usr/local/bin/
-        args: List of command-line arguments
+        name: Container name
 
     Returns:
-        dict with 'success', 'stdout', 'stderr' keys
+        tuple of (memory counter path, rootfs path), either may be None
     """
-    command = [f"/usr/local/bin/{script_name}"] + args
+    if name in METRIC_PATHS:
+        return METRIC_PATHS[name]
+
+    memory_path = None
+    for candidate in (
+        f"{CGROUP_ROOT}/lxc.payload.{name}/memory.current",
+        f"{CGROUP_ROOT}/memory/lxc.payload.{name}/memory.usage_in_bytes",
+        f"{CGROUP_ROOT}/memory/lxc/{name}/memory.usage_in_bytes",
+    ):
+        if os.path.isfile(candidate):
+            memory_path = candidate
+            break
+
+    rootfs_path = None
     try:
-        result = subprocess.run(
-            command,
-            env=LXD_ENV,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return {
-            "success": True,
-            "stdout": result.stdout,
-            "stderr": result.stderr
-        }
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {script_name}: {e.stderr}")
-        return {
-            "success": False,
-            "stdout": e.stdout,
-            "stderr": e.stderr
-        }
+        for pool in os.scandir(STORAGE_POOLS_DIR):
+            candidate = os.path.join(pool.path, "containers", name)
+            if os.path.isdir(candidate):
+                rootfs_path = candidate
+                break
+    except OSError:
+        pass
+
+    METRIC_PATHS[name] = (memory_path, rootfs_path)
+    return METRIC_PATHS[name]
+
+
+def forget_metric_sources(name: str):
+    """Drop the cached metric paths of a container and close its fd."""
+    METRIC_PATHS.pop(name, None)
+    fd = MEMORY_FDS.pop(name, None)
+    if fd is not None:
+        os.close(fd)
+
+
+def cleanup_metric_sources(live: set):
+    """
+    Forget the metric sources of containers that are no longer running.
+
+    Must not run while read_fallback_metrics is using them in a thread.
+    """
+    for stale in (METRIC_PATHS.keys() | MEMORY_FDS.keys()) - live:
+        forget_metric_sources(stale)
+
+
+def read_memory_usage(name: str) -> int:
+    """
+    Read a container's memory usage in bytes from its cgroup.
+
+    The counter file is kept open and re-read with pread(), which costs a
+    single syscall per refresh.
+    """
+    try:
+        fd = MEMORY_FDS.get(name)
+        if fd is None:
+            memory_path, _ = resolve_metric_paths(name)
+            if not memory_path:
+                return 0
+            fd = MEMORY_FDS[name] = os.open(memory_path, os.O_RDONLY)
+        return int(os.pread(fd, 32, 0))
+    except (OSError, ValueError):
+        # The cgroup went away (e.g. restart); resolve it again next time
+        forget_metric_sources(name)
+        return 0
+
+
+def read_disk_usage(name: str) -> int:
+    """Read a container's used disk space in bytes from its rootfs."""
+    _, rootfs_path = resolve_metric_paths(name)
+    if not rootfs_path:
+        return 0
+    try:
+        st = os.statvfs(rootfs_path)
+        return (st.f_blocks - st.f_bfree) * st.f_frsize
+    except OSError:
+        return 0
 
 
-def run_tracked_task(task_id: str, script_name: str, args: list, action: str, target: str):
+def read_fallback_metrics(wanted: list) -> list:
     """
-    Run a script and track its status in TASK_STORE.
+    Read a batch of host-side container metrics.
+
+    Args:
+        wanted: List of (container name, 'memory' or 'disk') pairs
+
+    Returns:
+        List of byte counts, in the same order
+    """
+    readers = {"memory": read_memory_usage, "disk": read_disk_usage}
+    return [readers[key](name) for name, key in wanted]
+
+
+async def run_tracked_task(task_id: str, coro, action: str, target: str):
+    """
+    Run an LXD action and track its status in TASK_STORE.
+
+    Started by run_action_queue once it holds a slot in ACTION_SEM, which
+    is released when the action finishes.
 
     Args:
         task_id: Unique task identifier
-        script_name: Name of the script to run
-        args: Arguments for the script
+        coro: Coroutine performing the action (see lxd_client)
         action: Human-readable action name
         target: Target of the action (e.g., container name)
     """
-    TASK_STORE[task_id].status = "running"
-
-    result = run_script(script_name, args)
+    error = None
+    try:
+        task = TASK_STORE[task_id]
+        task.status = "running"
+        try:
+            await coro
+        except Exception as e:
+            print(f"Error running {action} for {target}: {e}")
+            error = str(e)
+    finally:
+        ACTION_SEM.release()
+        coro.close()  # No-op once awaited
+
+    invalidate_containers_cache()
 
-    task = TASK_STORE[task_id]
     task.completed_at = time.time()
+    TASK_STORE.move_to_end(task_id)
 
-    if result["success"]:
+    if error is None:
         task.status = "success"
         task.message = f"{action} completed successfully for {target}"
     else:
         task.status = "error"
-        task.error = result["stderr"].strip() or "Unknown error occurred"
+        task.error = error or "Unknown error occurred"
+
+
+def start_tracked_task(*args):
+    """
+    Queue an action for run_action_queue; it stays 'pending' until started.
+
+    Args:
+        *args: Arguments for run_tracked_task
+    """
+    ACTION_QUEUE.put_nowait(args)
+
+
+async def run_action_queue():
+    """Start queued actions in order, at most MAX_CONCURRENT_ACTIONS at a time."""
+    while True:
+        args = await ACTION_QUEUE.get()
+        await ACTION_SEM.acquire()
+        task = asyncio.create_task(run_tracked_task(*args))
+        BACKGROUND_TASKS.add(task)
+        task.add_done_callback(BACKGROUND_TASKS.discard)
 
 
 # =============================================================================
@@ -185,139 +484,255 @@ def run_tracked_task(task_id: str, script_name: str, args: list, action: str, ta
 # =============================================================================
 
 
+async def collect_containers() -> dict:
+    """
+    Query LXD for all containers and build the dashboard payload.
+
+    Only run through start_containers_refresh, so runs never overlap: it
+    updates CPU_CACHE, CONFIG_CACHE and the metric sources unguarded.
+
+    Returns:
+        dict with 'containers' and 'redirections' lists
+    """
+    now_ns = time.monotonic_ns()
+
+    # Two listings: with state (recursion=2) for running instances only,
+    # and without it for the others, so stopped ones cost no state lookup.
+    # Each instance is projected as soon as it is parsed, so only one raw
+    # instance tree is alive at a time.
+    async def list_instances(recursion: int, status_filter: str) -> list:
+        return [
+            project_instance(c)
+            async for c in lxd_client.iter_instances(recursion, status_filter)
+        ]
+
+    running, others = await asyncio.gather(
+        list_instances(2, "status eq Running"),
+        list_instances(1, "status ne Running")
+    )
+    # A container starting or stopping between the two requests can show
+    # up in both listings (kept once, preferring the entry with state) or,
+    # for a single refresh, in neither
+    by_name = {inst.name: inst for inst in others}
+    by_name.update((inst.name, inst) for inst in running)
+    instances = sorted(by_name.values(), key=lambda inst: inst.name)
+    del running, others, by_name
+
+    containers = []
+    redirections = []
+    fallbacks = []  # (row, key) for metrics LXD left at 0
+
+    for inst in instances:
+        name = inst.name
+        ipv4 = "-"
+        memory_usage = 0
+        disk_usage = 0
+        cpu_usage = 0.0
+
+        if inst.running:
+            # Get the first IPv4 address of a non-loopback interface
+            ipv4 = next(
+                (addr["address"]
+                 for ifname, net in inst.network.items() if ifname != "lo"
+                 for addr in net.get("addresses", ())
+                 if addr.get("family") == "inet"
+                 and not addr.get("address", "").startswith("127.")),
+                "-"
+            )
+
+            memory_usage = inst.memory_usage
+            disk_usage = inst.disk_usage
+
+            # Calculate CPU usage
+            current_cpu_ns = inst.cpu_usage_ns
+
+            prev = CPU_CACHE.get(name)
+            if prev is not None:
+                time_delta_ns = now_ns - prev.t_ns
+                if time_delta_ns > 0:
+                    cpu_usage = round(
+                        (current_cpu_ns - prev.usage_ns) * 100 / time_delta_ns, 2
+                    )
+
+            # Get proxy devices (port redirections)
+            for dev_name, listen, connect in inst.proxies:
+                redirections.append({
+                    "container": name,
+                    "device_name": dev_name,
+                    "listen": listen,
+                    "connect": connect
+                })
+
+            CPU_CACHE[name] = CpuSample(now_ns, current_cpu_ns)
+
+        row = ContainerRow(
+            name=name,
+            status=inst.status,
+            ipv4=ipv4,
+            memory=memory_usage,
+            disk=disk_usage,
+            cpu_percent=cpu_usage,
+            os=inst.os,
+            release=inst.release,
+            architecture=inst.architecture
+        )
+        containers.append(row)
+
+        if inst.running:
+            if memory_usage == 0:
+                fallbacks.append((row, "memory"))
+            if disk_usage == 0:
+                fallbacks.append((row, "disk"))
+
+    live = {inst.name for inst in instances if inst.running}
+    cleanup_cpu_cache(live)
+    cleanup_config_cache({inst.name for inst in instances})
+
+    # Read all fallback metrics in a single worker thread
+    if fallbacks:
+        results = await asyncio.to_thread(
+            read_fallback_metrics, [(row.name, key) for row, key in fallbacks]
+        )
+        for (row, key), value in zip(fallbacks, results):
+            setattr(row, key, value)
+
+    # Only once the worker thread is done with them (a stopped container
+    # gets a new cgroup when started again)
+    cleanup_metric_sources(live)
+
+    return {"containers": containers, "redirections": redirections}
+
+
+async def refresh_containers_cache() -> tuple:
+    """Rebuild and store the encoded /containers payload."""
+    global CONTAINERS_CACHE, LAST_CONTAINERS_UPDATE
+
+    while True:
+        generation = CONTAINERS_GENERATION
+        encoded = encode_payload(await collect_containers())
+
+        # A snapshot taken before an invalidation is collected again, once
+        # however many invalidations happened meanwhile
+        if generation == CONTAINERS_GENERATION:
+            break
+
+    CONTAINERS_CACHE = encoded
+    LAST_CONTAINERS_UPDATE = time.monotonic()
+    async with CONTAINERS_CHANGED:
+        CONTAINERS_CHANGED.notify_all()
+    return encoded
+
+
+def start_containers_refresh() -> asyncio.Task:
+    """Start a refresh, or return the one already in flight (single-flight)."""
+    global CONTAINERS_REFRESH
+
+    if CONTAINERS_REFRESH is None:
+        CONTAINERS_REFRESH = asyncio.create_task(refresh_containers_cache())
+        CONTAINERS_REFRESH.add_done_callback(_clear_containers_refresh)
+    return CONTAINERS_REFRESH
+
+
+def invalidate_containers_cache():
+    """
+    Drop the cached snapshot and collect a new one right away.
+
+    A refresh already in flight is not duplicated: it collects again
+    before storing its result.
+    """
+    global CONTAINERS_CACHE, CONTAINERS_GENERATION
+
+    CONTAINERS_CACHE = None
+    CONTAINERS_GENERATION += 1
+    start_containers_refresh()
+
+
+def _clear_containers_refresh(task):
+    """Forget the finished refresh task so the next miss starts a new one."""
+    global CONTAINERS_REFRESH
+    if CONTAINERS_REFRESH is task:
+        CONTAINERS_REFRESH = None
+    if not task.cancelled():
+        task.exception()  # Errors are reported to awaiting callers
+
+
+async def collect_containers_loop():
+    """Refresh the container snapshot in the background, forever."""
+    while True:
+        try:
+            await asyncio.shield(start_containers_refresh())
+        except Exception as e:
+            print(f"Error collecting containers: {e}")
+        await asyncio.sleep(CONTAINERS_CACHE_DURATION)
+
+
 @app.get("/containers")
-def list_containers():
+async def list_containers(request: Request):
     """Get list of all containers with their status and metrics."""
-    try:
-        current_time = time.time()
-
-        result = subprocess.run(
-            ["lxc", "list", "--format=json"],
-            env=LXD_ENV,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+    current_time = time.monotonic()
+
+    # Serve the collected snapshot while still fresh
+    if CONTAINERS_CACHE is not None and (
+        current_time - LAST_CONTAINERS_UPDATE < CONTAINERS_CACHE_DURATION
+    ):
+        return etag_response(request, *CONTAINERS_CACHE)
 
-        raw = json.loads(result.stdout)
-        containers = []
-        redirections = []
-
-        for c in raw:
-            name = c.get("name", "unknown")
-            status = c.get("status", "Unknown")
-            state = c.get("state", {})
-            config = c.get("config", {})
-            devices = c.get("devices", {})
-
-            ipv4 = "-"
-            memory_usage = 0
-            disk_usage = 0
-            cpu_usage = 0
-            os_name = "-"
-            release = "-"
-            architecture = "-"
-
-            if config:
-                os_name = config.get("image.os", "Unknown")
-                release = config.get("image.release", "Unknown")
-                architecture = config.get("image.architecture", "Unknown")
-
-            if status == "Running" and state:
-                # Get IPv4 address
-                network = state.get("network", {})
-                for ifname, net in network.items():
-                    if ifname != "lo" and isinstance(net, dict):
-                        for addr in net.get("addresses", []):
-                            if addr.get("family") == "inet":
-                                ipv4 = addr["address"]
-
-                # Get memory usage
-                memory = state.get("memory", {})
-                memory_usage = memory.get("usage", 0)
-                if memory_usage == 0:
-                    try:
-                        cmd = "awk '/MemTotal/ {t=$2} /MemAvailable/ {a=$2} END {print (t-a)*1024}' /proc/meminfo"
-                        res = subprocess.run(
-                            ["lxc", "exec", name, "--", "sh", "-c", cmd],
-                            env=LXD_ENV, capture_output=True, text=True
-                        )
-                        if res.returncode == 0 and res.stdout.strip():
-                            memory_usage = int(float(res.stdout.strip()))
-                    except Exception:
-                        pass
-
-                # Get disk usage
-                disk = state.get("disk", {})
-                if isinstance(disk, dict):
-                    for _, d in disk.items():
-                        disk_usage += d.get("usage", 0)
-                if disk_usage == 0:
-                    try:
-                        cmd = "df -P / | tail -n 1 | awk '{print $3 * 1024}'"
-                        res = subprocess.run(
-                            ["lxc", "exec", name, "--", "sh", "-c", cmd],
-                            env=LXD_ENV, capture_output=True, text=True
-                        )
-                        if res.returncode == 0 and res.stdout.strip():
-                            disk_usage = int(res.stdout.strip())
-                    except Exception:
-                        pass
-
-                # Calculate CPU usage
-                cpu = state.get("cpu", {})
-                current_cpu_ns = cpu.get("usage", 0)
-
-                if name in CPU_CACHE:
-                    prev = CPU_CACHE[name]
-                    prev_time = prev['time']
-                    prev_usage = prev['usage']
-                    time_delta = current_time - prev_time
-                    cpu_delta_ns = current_cpu_ns - prev_usage
-                    cpu_delta_sec = cpu_delta_ns / 1_000_000_000
-
-                    if time_delta > 0:
-                        cpu_usage = (cpu_delta_sec / time_delta) * 100
-                        cpu_usage = round(cpu_usage, 2)
-
-                # Get proxy devices (port redirections)
-                if devices:
-                    for dev_name, dev_config in devices.items():
-                        if dev_config.get("type") == "proxy":
-                            redirections.append({
-                                "container": name,
-                                "device_name": dev_name,
-                                "listen": dev_config.get("listen", ""),
-                                "connect": dev_config.get("connect", "")
-                            })
-
-                CPU_CACHE[name] = {
-                    'time': current_time,
-                    'usage': current_cpu_ns
-                }
-
-            containers.append({
-                "name": name,
-                "status": status,
-                "ipv4": ipv4,
-                "memory": memory_usage,
-                "disk": disk_usage,
-                "cpu_time": f"{cpu_usage}%",
-                "os": os_name,
-                "release": release,
-                "architecture": architecture
-            })
-
-        return {"containers": containers, "redirections": redirections}
+    try:
+        encoded = await asyncio.shield(start_containers_refresh())
     except Exception as e:
         return {"error": str(e)}
 
+    return etag_response(request, *encoded)
+
+
+@app.get("/containers/stream")
+async def stream_containers(request: Request):
+    """Stream the container list as Server-Sent Events when it changes."""
+    async def events():
+        last_etag = None
+        while not await request.is_disconnected():
+            if CONTAINERS_CACHE is not None and CONTAINERS_CACHE[1] != last_etag:
+                body, last_etag = CONTAINERS_CACHE
+                yield b"data: " + body + b"\n\n"
+
+            # Never yield with the lock held: a slow client would block
+            # refresh_containers_cache from notifying
+            idle = False
+            async with CONTAINERS_CHANGED:
+                try:
+                    await asyncio.wait_for(
+                        CONTAINERS_CHANGED.wait(), STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    idle = True
+            if idle:
+                yield b": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 
 # =============================================================================
 # Task Tracking Endpoints
 # =============================================================================
 
 
+@app.get("/tasks")
+def get_task_counters():
+    """Get the number of queued, running and tracked background tasks."""
+    cleanup_old_tasks()
+
+    statuses = [task.status for task in TASK_STORE.values()]
+    return {
+        "queued": statuses.count("pending"),
+        "running": statuses.count("running"),
+        "total": len(statuses)
+    }
+
+
 @app.get("/tasks/{task_id}")
 def get_task_status(task_id: str):
     """Get the status of a background task."""
@@ -339,10 +754,9 @@ def get_task_status(task_id: str):
 
 
 @app.post("/containers")
-async def create_container(req: ContainerRequest, background_tasks: BackgroundTasks):
+async def create_container(req: ContainerRequest):
     """Create a new container in the background."""
     task_id = str(uuid.uuid4())
-    distro_clean = req.distro.lower().replace(" ", "")
 
     # Create task entry
     TASK_STORE[task_id] = TaskResult(
@@ -352,11 +766,14 @@ async def create_container(req: ContainerRequest, background_tasks: BackgroundTa
         target=req.name
     )
 
-    background_tasks.add_task(
-        run_tracked_task,
+    # A container previously deleted under this name may not have been seen
+    CONFIG_CACHE.pop(req.name.lower(), None)
+
+    start_tracked_task(
         task_id,
-        "create-ct",
-        [req.name, req.user, req.password, distro_clean, req.version],
+        lxd_client.create(
+            req.name, req.user, req.password, req.distro, req.version
+        ),
         "Container creation",
         req.name
     )
@@ -368,21 +785,25 @@ async def create_container(req: ContainerRequest, background_tasks: BackgroundTa
 
 
 @app.delete("/containers/{name}")
-def delete_container(name: str):
-    """Delete a container by name."""
-    result = run_script("delete-ct", [name])
-
-    if result["success"]:
-        return {"message": f"Container {name} deleted."}
-    else:
+async def delete_container(name: str):
+    """Delete a container by name (force-stopping it if needed)."""
+    try:
+        await lxd_client.delete(name)
+    except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=result["stderr"].strip() or "Failed to delete container"
+            detail=str(e) or "Failed to delete container"
         )
 
+    CPU_CACHE.pop(name, None)
+    CONFIG_CACHE.pop(name, None)
+    # Its metric sources are released by the refresh started here
+    invalidate_containers_cache()
+    return {"message": f"Container {name} deleted."}
+
 
 @app.post("/containers/{name}/stop")
-async def stop_container(name: str, background_tasks: BackgroundTasks):
+async def stop_container(name: str):
     """Stop a running container."""
     task_id = str(uuid.uuid4())
 
@@ -393,11 +814,9 @@ async def stop_container(name: str, background_tasks: BackgroundTasks):
         target=name
     )
 
-    background_tasks.add_task(
-        run_tracked_task,
+    start_tracked_task(
         task_id,
-        "stop-ct",
-        [name],
+        lxd_client.stop(name),
         "Stop container",
         name
     )
@@ -406,7 +825,7 @@ async def stop_container(name: str, background_tasks: BackgroundTasks):
 
 
 @app.post("/containers/{name}/start")
-async def start_container(name: str, background_tasks: BackgroundTasks):
+async def start_container(name: str):
     """Start a stopped container."""
     task_id = str(uuid.uuid4())
 
@@ -417,11 +836,9 @@ async def start_container(name: str, background_tasks: BackgroundTasks):
         target=name
     )
 
-    background_tasks.add_task(
-        run_tracked_task,
+    start_tracked_task(
         task_id,
-        "start-ct",
-        [name],
+        lxd_client.start(name),
         "Start container",
         name
     )
@@ -434,74 +851,97 @@ async def start_container(name: str, background_tasks: BackgroundTasks):
 # =============================================================================
 
 
-@app.get("/images")
-def get_available_images():
-    """Get list of available LXD images (cached for 1 hour)."""
-    global IMAGES_CACHE, LAST_CACHE_UPDATE
+def release_sort_key(release: str) -> tuple:
+    """
+    Sort key ordering numbered releases by version, after named ones.
 
-    current_time = time.time()
+    Args:
+        release: Release name (e.g. 12, 24.04 or current)
+    """
+    try:
+        return (1, Version(release))
+    except InvalidVersion:
+        return (0, release)
 
-    # Return cache if still valid
-    if IMAGES_CACHE and (current_time - LAST_CACHE_UPDATE < CACHE_DURATION):
-        return IMAGES_CACHE
 
-    try:
-        # Determine system architecture
-        arch = platform.machine()
-        if arch == "x86_64":
-            lxc_arch = "amd64"
-        elif arch == "aarch64":
-            lxc_arch = "arm64"
-        else:
-            lxc_arch = arch
+async def fetch_available_images() -> dict:
+    """
+    List the container images available for this host's architecture.
 
-        print(f"Fetching images for architecture: {lxc_arch}...")
+    Returns:
+        dict mapping each whitelisted OS to its releases (newest first)
+    """
+    print(f"Fetching images for architecture: {LXC_ARCH}...")
 
-        cmd = [
-            "lxc", "image", "list", "images:",
-            f"type=container",
-            f"architecture={lxc_arch}",
-            "--format=json"
-        ]
+    raw_images = await lxd_client.list_remote_images(LXC_ARCH)
 
-        result = subprocess.run(
-            cmd, env=LXD_ENV, capture_output=True, text=True, check=True
-        )
-        raw_images = json.loads(result.stdout)
+    buckets = {}
 
-        processed = {}
+    for img in raw_images:
+        os_name = img.get("os")
+        release = img.get("release")
 
-        for img in raw_images:
-            props = img.get("properties", {})
-            os_name = props.get("os")
-            release = props.get("release")
+        if not os_name or not release:
+            continue
 
-            if not os_name or not release:
-                continue
+        os_name = os_name.lower()
 
-            os_name = os_name.lower()
+        if os_name not in WHITELIST_OS:
+            continue
 
-            if os_name not in WHITELIST_OS:
-                continue
+        buckets.setdefault(os_name, set()).add(release)
 
-            if os_name not in processed:
-                processed[os_name] = []
+    # Sort releases newest first (10 before 9)
+    return {
+        os_name: sorted(releases, key=release_sort_key, reverse=True)
+        for os_name, releases in buckets.items()
+    }
 
-            if release not in processed[os_name]:
-                processed[os_name].append(release)
 
-        # Sort releases in descending order
-        for os_name in processed:
-            processed[os_name].sort(reverse=True)
+async def refresh_images_cache(force: bool = True) -> tuple:
+    """
+    Fetch the image catalog and store its encoded payload.
 
-        IMAGES_CACHE = processed
-        LAST_CACHE_UPDATE = current_time
+    Args:
+        force: Refresh even if a catalog is already stored
 
-        return processed
+    Returns:
+        tuple of (JSON bytes, quoted ETag)
+    """
+    global IMAGES_CACHE
 
-    except Exception as e:
-        print(f"Error fetching images: {e}")
-        return {}
+    async with IMAGES_LOCK:
+        # Another caller may have stored a catalog while we waited
+        if force or IMAGES_CACHE is None:
+            IMAGES_CACHE = encode_payload(await fetch_available_images())
+        return IMAGES_CACHE
+
+
+async def refresh_images_loop():
+    """Keep the image catalog fresh in the background, forever."""
+    while True:
+        try:
+            await refresh_images_cache()
+            delay = CACHE_DURATION
+        except Exception as e:
+            print(f"Error fetching images: {e}")
+            delay = IMAGES_RETRY
+        await asyncio.sleep(delay)
+
+
+@app.get("/images")
+async def get_available_images(request: Request):
+    """Get list of available LXD images (refreshed hourly in the background)."""
+    encoded = IMAGES_CACHE
+    if encoded is None:
+        # Startup fetch not done (or failed): fetch once for all waiters
+        try:
+            encoded = await refresh_images_cache(force=False)
+        except Exception as e:
+            print(f"Error fetching images: {e}")
+            return {}
+
+    return etag_response(request, *encoded, max_age=CACHE_DURATION)
 
 
 # =============================================================================
@@ -514,17 +954,23 @@ async def expose_container_port(name: str, req: ExposeRequest):
     """Expose a container port to the host."""
     device_name = f"proxy-{req.container_port}"
 
-    cmd = [
-        "lxc", "config", "device", "add", name, device_name, "proxy",
-        f"listen=tcp:0.0.0.0:{req.host_port}",
-        f"connect=tcp:127.0.0.1:{req.container_port}"
-    ]
+    device = {
+        "type": "proxy",
+        "listen": f"tcp:0.0.0.0:{req.host_port}",
+        "connect": f"tcp:127.0.0.1:{req.container_port}"
+    }
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            return {"error": result.stderr.strip()}
+        instance = await lxd_client.request("GET", f"/1.0/instances/{name}")
+        if device_name in instance.get("devices", {}):
+            return {"error": "The device already exists"}
+
+        # PATCH merges the new device into the existing ones
+        await lxd_client.request(
+            "PATCH", f"/1.0/instances/{name}",
+            json={"devices": {device_name: device}}
+        )
+        invalidate_containers_cache()
 
         return {
             "message": f"Port {req.host_port} redirected to container {name}:{req.container_port}"
@@ -534,15 +980,28 @@ async def expose_container_port(name: str, req: ExposeRequest):
 
 
 @app.delete("/containers/{name}/expose/{device_name}")
-def remove_expose(name: str, device_name: str):
+async def remove_expose(name: str, device_name: str):
     """Remove a port redirection from a container."""
-    cmd = ["lxc", "config", "device", "remove", name, device_name]
-
     try:
-        result = subprocess.run(cmd, env=LXD_ENV, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            return {"error": result.stderr.strip()}
+        instance = await lxd_client.request("GET", f"/1.0/instances/{name}")
+        devices = instance.get("devices", {})
+        if devices.pop(device_name, None) is None:
+            return {"error": "Device doesn't exist"}
+
+        # PUT replaces the whole writable configuration
+        await lxd_client.request(
+            "PUT", f"/1.0/instances/{name}",
+            json={
+                "architecture": instance.get("architecture"),
+                "config": instance.get("config", {}),
+                "devices": devices,
+                "ephemeral": instance.get("ephemeral", False),
+                "profiles": instance.get("profiles", []),
+                "stateful": instance.get("stateful", False),
+                "description": instance.get("description", "")
+            }
+        )
+        invalidate_containers_cache()
 
         return {"message": f"Redirection {device_name} removed."}
     except Exception as e:
@@ -336,103 +336,130 @@ document.addEventListener('DOMContentLoaded', initForm);
 async function loadContainers() {
   try {
     const response = await fetch(`${API_URL}/containers`);
-    const data = await response.json();
-
-    // Expose select dropdown for port redirection
-    const exposeSelect = document.getElementById('exposeContainerSelect');
-    let currentSelection = "";
-
-    // Containers table
-    const tbody = document.querySelector("#containerTable tbody");
-    tbody.innerHTML = "";
-
-    // Update containers table
-    if (!data.containers || data.containers.length === 0) {
-      tbody.innerHTML = '<tr><td colspan="8">No containers found.</td></tr>';
-    } else {
-        if (data.error) {
-        tbody.innerHTML = `<tr><td colspan="8">Error: ${data.error}</td></tr>`;
-        return;
-        }
+    renderContainers(await response.json());
+  } catch (err) {
+    console.error(err);
+  }
+}
 
-        if (exposeSelect) {
-        currentSelection = exposeSelect.value;
-        exposeSelect.innerHTML = '<option value="">-- Choose a container --</option>';
-        }
+/**
+ * Follow container updates pushed by the backend (polling as a fallback)
+ */
+function watchContainers() {
+  if (!window.EventSource) {
+    loadContainers();
+    setInterval(loadContainers, 5000);
+    return;
+  }
 
-        data.containers.forEach(c => {
-        const row = document.createElement("tr");
-
-        const ramDisplay = c.status === "Running" ? formatBytes(c.memory) : "-";
-        const diskDisplay = c.status === "Running" ? formatBytes(c.disk) : "-";
-        const cpuDisplay = c.status === "Running" ? `${c.cpu_time}` : "-";
-
-        const actionBtn = (c.status === "Running" || c.status === "RUNNING")
-            ? `<button class="stop-btn" onclick="stopContainer('${c.name}')">Stop</button>`
-            : `<button class="start-btn" onclick="startContainer('${c.name}')">Start</button>`;
-
-        const ipDisplay = c.ipv4
-            ? `${c.ipv4} <button class="copy-btn" onclick="copyText('${c.ipv4}')">COPY</button>`
-            : `-`;
-
-        row.innerHTML = `
-            <td><strong>${c.name}</strong></td>
-            <td>${c.status}</td>
-            <td>${ipDisplay}</td>
-            <td>${ramDisplay}</td>
-            <td>${diskDisplay}</td>
-            <td>${cpuDisplay}</td>
-            <td>${c.os} ${c.release} (${c.architecture})</td>
-            <td>
-            <button class="delete-btn" onclick="deleteContainer('${c.name}')">Delete</button>
-            ${actionBtn}
-            </td>
-        `;
+  // EventSource reconnects on its own if the stream drops
+  const source = new EventSource(`${API_URL}/containers/stream`);
+  source.onmessage = (event) => {
+    try {
+      renderContainers(JSON.parse(event.data));
+    } catch (err) {
+      console.error(err);
+    }
+  };
+}
 
-        tbody.appendChild(row);
+/**
+ * Render the containers and redirections tables
+ * @param {Object} data - Payload returned by /containers
+ */
+function renderContainers(data) {
+  // Expose select dropdown for port redirection
+  const exposeSelect = document.getElementById('exposeContainerSelect');
+  let currentSelection = "";
+
+  // Containers table
+  const tbody = document.querySelector("#containerTable tbody");
+  tbody.innerHTML = "";
+
+  // Update containers table
+  if (!data.containers || data.containers.length === 0) {
+    tbody.innerHTML = '<tr><td colspan="8">No containers found.</td></tr>';
+  } else {
+      if (data.error) {
+      tbody.innerHTML = `<tr><td colspan="8">Error: ${data.error}</td></tr>`;
+      return;
+      }
 
-        if (exposeSelect && (c.status === "Running" || c.status === "RUNNING")) {
-            const opt = document.createElement('option');
-            opt.value = c.name;
-            opt.text = c.name;
-            exposeSelect.appendChild(opt);
-        }
-        });
-    }
+      if (exposeSelect) {
+      currentSelection = exposeSelect.value;
+      exposeSelect.innerHTML = '<option value="">-- Choose a container --</option>';
+      }
 
-    // Update redirections table
-    const redTbody = document.querySelector("#redirectionsTable tbody");
-    if (redTbody) {
-      redTbody.innerHTML = "";
-
-      if (data.redirections && data.redirections.length > 0) {
-        data.redirections.forEach(r => {
-          const tr = document.createElement("tr");
-              
-          const hostPort = r.listen.replace('tcp:0.0.0.0:', '').replace('tcp:', '');
-          const targetPort = r.connect.replace('tcp:127.0.0.1:', '').replace('tcp:', '');
-
-          tr.innerHTML = `
-            <td><strong>${r.container}</strong></td>
-            <td>${r.device_name}</td>
-            <td><a href="${API_URL}:${hostPort}" style="color: var(--color-primary);">${hostPort}</a></td>
-            <td>${targetPort}</td>
-            <td>
-              <button class="delete-btn" onclick="deleteRedirection('${r.container}', '${r.device_name}')">Delete</button>
-            </td>
-          `;
-          redTbody.appendChild(tr);
-        });
-      } else {
-        redTbody.innerHTML = '<tr><td colspan="5">No active redirections.</td></tr>';
+      data.containers.forEach(c => {
+      const row = document.createElement("tr");
+
+      const ramDisplay = c.status === "Running" ? formatBytes(c.memory) : "-";
+      const diskDisplay = c.status === "Running" ? formatBytes(c.disk) : "-";
+      const cpuDisplay = c.status === "Running" ? `${c.cpu_percent}%` : "-";
+
+      const actionBtn = (c.status === "Running" || c.status === "RUNNING")
+          ? `<button class="stop-btn" onclick="stopContainer('${c.name}')">Stop</button>`
+          : `<button class="start-btn" onclick="startContainer('${c.name}')">Start</button>`;
+
+      const ipDisplay = c.ipv4
+          ? `${c.ipv4} <button class="copy-btn" onclick="copyText('${c.ipv4}')">COPY</button>`
+          : `-`;
+
+      row.innerHTML = `
+          <td><strong>${c.name}</strong></td>
+          <td>${c.status}</td>
+          <td>${ipDisplay}</td>
+          <td>${ramDisplay}</td>
+          <td>${diskDisplay}</td>
+          <td>${cpuDisplay}</td>
+          <td>${c.os} ${c.release} (${c.architecture})</td>
+          <td>
+          <button class="delete-btn" onclick="deleteContainer('${c.name}')">Delete</button>
+          ${actionBtn}
+          </td>
+      `;
+
+      tbody.appendChild(row);
+
+      if (exposeSelect && (c.status === "Running" || c.status === "RUNNING")) {
+          const opt = document.createElement('option');
+          opt.value = c.name;
+          opt.text = c.name;
+          exposeSelect.appendChild(opt);
       }
-    }
+      });
+  }
 
-    if (exposeSelect && currentSelection) {
-      exposeSelect.value = currentSelection;
+  // Update redirections table
+  const redTbody = document.querySelector("#redirectionsTable tbody");
+  if (redTbody) {
+    redTbody.innerHTML = "";
+
+    if (data.redirections && data.redirections.length > 0) {
+      data.redirections.forEach(r => {
+        const tr = document.createElement("tr");
+            
+        const hostPort = r.listen.replace('tcp:0.0.0.0:', '').replace('tcp:', '');
+        const targetPort = r.connect.replace('tcp:127.0.0.1:', '').replace('tcp:', '');
+
+        tr.innerHTML = `
+          <td><strong>${r.container}</strong></td>
+          <td>${r.device_name}</td>
+          <td><a href="${API_URL}:${hostPort}" style="color: var(--color-primary);">${hostPort}</a></td>
+          <td>${targetPort}</td>
+          <td>
+            <button class="delete-btn" onclick="deleteRedirection('${r.container}', '${r.device_name}')">Delete</button>
+          </td>
+        `;
+        redTbody.appendChild(tr);
+      });
+    } else {
+      redTbody.innerHTML = '<tr><td colspan="5">No active redirections.</td></tr>';
     }
-  } catch (err) {
-    console.error(err);
+  }
+
+  if (exposeSelect && currentSelection) {
+    exposeSelect.value = currentSelection;
   }
 }
 
@@ -461,6 +488,15 @@ async function createContainer() {
     });
     const data = await res.json();
 
+    if (!res.ok) {
+      // Validation errors (422) carry a list of {msg, ...} entries
+      const detail = Array.isArray(data.detail)
+        ? data.detail.map(d => d.msg).join(', ')
+        : data.detail;
+      Toaster.show(`Error: ${detail || 'Failed to create container'}`, "error");
+      return;
+    }
+
     // Clear form
     document.getElementById('cName').value = '';
     document.getElementById('cUser').value = '';
@@ -637,5 +673,4 @@ function formatBytes(bytes, decimals = 2) {
    Initialization
    ========================================================================== */
 
-loadContainers();
-setInterval(loadContainers, 5000);
+watchContainers();